@@ -12,12 +12,30 @@ Created: January 2024
 """
 # app.py
 from kivy.app import App
-from kivy.metrics import dp
-from database import InventoryDatabase
-from ui import InventoryUI
-from components.login import LoginScreen
+from kivy.metrics import dp, Metrics
 from kivy.config import Config
 from kivy.uix.boxlayout import BoxLayout
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import sys
+import threading
+
+# Database instances keyed by a hash of their connection string, so logging
+# in again with the same credentials reuses the existing client
+_DB_POOL = {}
+_DB_POOL_LOCK = threading.Lock()
+
+
+def _db_worker_count():
+    """Number of database worker threads to run.
+
+    On a free-threaded build with the GIL disabled (e.g. PYTHON_GIL=0),
+    workers run in parallel, so scale with the CPU count.
+    """
+    if hasattr(sys, '_is_gil_enabled') and not sys._is_gil_enabled():
+        return os.cpu_count() or 2
+    return 2
 
 
 class RootWidget(BoxLayout):
@@ -28,11 +46,27 @@ class RootWidget(BoxLayout):
 
 class InventoryApp(App):
     icon = 'icon.ico'
+    _common_styles = None
 
     def build(self):
         """Initialize the application and return the root widget."""
         Config.set('kivy', 'window_icon', 'icon.ico')
 
+        # Cached styles hold dp() values, so rebuild them if density changes
+        Metrics.bind(density=self._invalidate_styles)
+
+        # No database until the user has logged in
+        self.inventory_db = None
+
+        # Shared worker threads for blocking database calls, so each one
+        # does not have to start its own thread
+        self.db_executor = ThreadPoolExecutor(
+            max_workers=_db_worker_count(), thread_name_prefix='db'
+        )
+
+        # Only the login screen is needed before the user signs in
+        from components.login import LoginScreen
+
         # Create root widget
         self.root_widget = RootWidget()
 
@@ -42,11 +76,29 @@ class InventoryApp(App):
 
         return self.root_widget
 
-    def on_login_success(self, connection_string):
+    def connect_database(self, connection_string, **client_options):
+        """Return a connected database, reusing a pooled one if possible.
+
+        Runs on db_executor so the connection handshake does not block the UI.
+        client_options are passed to MongoClient when a new client is made.
+        """
+        # Deferred so the database driver loads after the login screen
+        from database import InventoryDatabase
+
+        # Reuse the database for this connection string if we have one
+        pool_key = hashlib.sha256(connection_string.encode()).hexdigest()
+        with _DB_POOL_LOCK:
+            if pool_key not in _DB_POOL:
+                _DB_POOL[pool_key] = InventoryDatabase(connection_string, **client_options)
+            return _DB_POOL[pool_key]
+
+    def on_login_success(self, inventory_db):
         """Called when login is successful."""
+        # Deferred so the main UI loads after login
+        from ui import InventoryUI
+
         try:
-            # Initialize database with connection string
-            self.inventory_db = InventoryDatabase(connection_string)
+            self.inventory_db = inventory_db
 
             # Create the main UI
             main_ui = InventoryUI()
@@ -59,17 +111,31 @@ class InventoryApp(App):
             self.login_screen.error_label.text = str(e)
 
     def get_database(self):
-        """Get the database instance."""
+        """Get the database instance, or None before login."""
         return self.inventory_db
 
     def on_stop(self):
         """Clean up resources when the application closes."""
-        if hasattr(self, 'inventory_db'):
-            if hasattr(self.inventory_db, 'client'):
-                self.inventory_db.client.close()
+        for db in _DB_POOL.values():
+            db.client.close()
+        _DB_POOL.clear()
+        self.inventory_db = None
+        self.db_executor.shutdown(wait=False)
+
+    def _invalidate_styles(self, *args):
+        self._common_styles = None
 
     def get_common_styles(self):
         """Return common styles used throughout the application."""
+        if self._common_styles is None:
+            self._common_styles = self._build_common_styles()
+        return self._common_styles
+
+    def get_style(self, name):
+        """Return one section of the common styles, e.g. 'colors'."""
+        return self.get_common_styles()[name]
+
+    def _build_common_styles(self):
         return {
             'button_style': {
                 'size_hint_y': None,
@@ -11,13 +11,27 @@ and cloud database integration.
 Created: January 2024
 """
 # components/__init__.py
+import importlib
 
-from .add_item import AddItemForm
-from .search import SearchInterface
-from .export import ExportInterface
+# Components are imported on first access so the login screen does not
+# pay for loading the main interface modules.
+_LAZY = {
+    'AddItemForm': 'add_item',
+    'SearchInterface': 'search',
+    'ExportInterface': 'export'
+}
 
 __all__ = [
     'AddItemForm',
     'SearchInterface',
     'ExportInterface'
-] 
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module('.' + _LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
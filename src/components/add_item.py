@@ -13,7 +13,6 @@ Created: January 2024
 
 # components/add_item.py
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.button import Button
 from kivy.uix.label import Label
@@ -22,8 +21,22 @@ from kivy.uix.spinner import Spinner
 from kivy.uix.image import Image
 from kivy.metrics import dp
 from kivy.app import App
+from kivy.clock import Clock
+from types import SimpleNamespace
 from utils.file_chooser import choose_image
-import os
+
+CONDITION_VALUES = ('New', 'Good', 'Fair', 'Poor')
+STATUS_VALUES = ('Available', 'In Use', 'Under Maintenance', 'Retired')
+
+
+def _fit_label_width(label, width):
+    """Wrap label text to its width; the texture is already centred vertically."""
+    label.text_size = (width, None)
+
+
+def _parse_numeric(text, cast, default):
+    """Convert a filtered numeric input, using default when it is empty."""
+    return cast(text) if text else default
 
 
 class LabeledInput(BoxLayout):
@@ -41,7 +54,7 @@ class LabeledInput(BoxLayout):
             halign='right',
             valign='middle'
         )
-        self.label.bind(size=self.label.setter('text_size'))
+        self.label.fbind('width', _fit_label_width)
 
         # Input (TextInput or Spinner)
         input_widget.size_hint_x = 0.7
@@ -51,6 +64,31 @@ class LabeledInput(BoxLayout):
 
 
 class AddItemForm(BoxLayout):
+    # (label, hint, multiline) for each text field
+    _FIELDS = (
+        ('Asset ID', 'Enter asset ID', False),
+        ('Item Name', 'Enter item name', False),
+        ('Description', 'Enter description', True),
+        ('Location', 'Enter location', False),
+        ('Department', 'Enter department', False),
+        ('Purchase Price', '0.00', False),
+        ('Quantity', '1', False),
+        ('Model Number', 'Enter model number', False),
+        ('Serial Number', 'Enter serial number', False)
+    )
+
+    # Numeric fields only accept characters their parser understands
+    _INPUT_FILTERS = {
+        'Purchase Price': 'float',
+        'Quantity': 'int'
+    }
+
+    # (label, values) for each dropdown
+    _DROPDOWNS = (
+        ('Condition', CONDITION_VALUES),
+        ('Status', STATUS_VALUES)
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.orientation = 'vertical'
@@ -58,14 +96,34 @@ class AddItemForm(BoxLayout):
         self.spacing = dp(10)
 
         self.app = App.get_running_app()
-        self.styles = self.app.get_common_styles()
+        self.db = self.app.get_database()
+        self._c = SimpleNamespace(**self.app.get_style('colors'))
         self.selected_image_path = None
 
+        # The form is built once and kept around; messages are swapped in
+        # place of it rather than tearing the widget tree down
+        self._form_root = None
+        self._status_label = Label(
+            size_hint_y=None,
+            height=dp(40)
+        )
+
         self.setup_form()
 
     def setup_form(self):
+        """Show the form, building its widget tree on first use."""
+        if self._form_root is None:
+            self._build_form_once()
+        if self._status_label.parent is not None:
+            self.remove_widget(self._status_label)
+        if self._form_root.parent is None:
+            self.add_widget(self._form_root)
+
+    def _build_form_once(self):
+        self._form_root = BoxLayout(orientation='vertical', spacing=dp(10))
+
         # Title
-        self.add_widget(Label(
+        self._form_root.add_widget(Label(
             text='Add New Item',
             size_hint_y=None,
             height=dp(40),
@@ -82,27 +140,15 @@ class AddItemForm(BoxLayout):
 
         # Form fields
         self.inputs = {}
-        fields = [
-            ('Asset ID', 'Enter asset ID', False),
-            ('Item Name', 'Enter item name', False),
-            ('Description', 'Enter description', True),
-            ('Location', 'Enter location', False),
-            ('Department', 'Enter department', False),
-            ('Purchase Price', '0.00', False),
-            ('Quantity', '1', False),  # Add this line
-            ('Model Number', 'Enter model number', False),
-            ('Serial Number', 'Enter serial number', False)
-        ]
-
-        for field, hint, is_multiline in fields:
+        for field, hint, is_multiline in self._FIELDS:
             if is_multiline:
                 input_widget = TextInput(
                     hint_text=hint,
                     multiline=True,
                     height=dp(100),
                     size_hint_y=None,
-                    background_color=self.styles['colors']['surface'],
-                    foreground_color=self.styles['colors']['text']
+                    background_color=self._c.surface,
+                    foreground_color=self._c.text
                 )
                 container = LabeledInput(field, input_widget)
                 container.height = dp(100)
@@ -110,11 +156,11 @@ class AddItemForm(BoxLayout):
                 input_kwargs = {
                     'hint_text': hint,
                     'multiline': False,
-                    'background_color': self.styles['colors']['surface'],
-                    'foreground_color': self.styles['colors']['text']
+                    'background_color': self._c.surface,
+                    'foreground_color': self._c.text
                 }
-                if field == 'Purchase Price':
-                    input_kwargs['input_filter'] = 'float'
+                if field in self._INPUT_FILTERS:
+                    input_kwargs['input_filter'] = self._INPUT_FILTERS[field]
                 input_widget = TextInput(**input_kwargs)
                 container = LabeledInput(field, input_widget)
 
@@ -122,16 +168,13 @@ class AddItemForm(BoxLayout):
             main_container.add_widget(container)
 
         # Dropdowns
-        for field, values in [
-            ('Condition', ['New', 'Good', 'Fair', 'Poor']),
-            ('Status', ['Available', 'In Use', 'Under Maintenance', 'Retired'])
-        ]:
+        for field, values in self._DROPDOWNS:
             spinner = Spinner(
                 text=values[0],
                 values=values,
                 background_normal='',
-                background_color=self.styles['colors']['primary'],
-                color=self.styles['colors']['text']
+                background_color=self._c.primary,
+                color=self._c.text
             )
             container = LabeledInput(field, spinner)
             self.inputs[field] = spinner
@@ -163,7 +206,7 @@ class AddItemForm(BoxLayout):
             text='Choose Image',
             size_hint_x=0.5,
             background_normal='',
-            background_color=self.styles['colors']['primary']
+            background_color=self._c.primary
         )
         self.choose_image_button.bind(on_press=self.select_image)
 
@@ -171,7 +214,7 @@ class AddItemForm(BoxLayout):
             text='Remove Image',
             size_hint_x=0.5,
             background_normal='',
-            background_color=self.styles['colors']['error'],
+            background_color=self._c.error,
             disabled=True
         )
         self.remove_image_button.bind(on_press=self.remove_image)
@@ -190,29 +233,31 @@ class AddItemForm(BoxLayout):
         )
 
         # Submit button
-        submit_button = Button(
+        self.submit_button = Button(
             text='Submit',
             size_hint=(None, None),
             size=(dp(200), dp(40)),
             pos_hint={'center_x': 0.5},
             background_normal='',
-            background_color=self.styles['colors']['success']
+            background_color=self._c.success
         )
-        submit_button.bind(on_press=self.submit_form)
+        self.submit_button.bind(on_press=self.submit_form)
 
-        submit_container.add_widget(submit_button)
+        submit_container.add_widget(self.submit_button)
         main_container.add_widget(submit_container)
 
         # Add scroll view
         scroll = ScrollView(size_hint=(1, 1))
         scroll.add_widget(main_container)
-        self.add_widget(scroll)
+        self._form_root.add_widget(scroll)
 
     def select_image(self, instance):
         """Open native file dialog to select an image."""
         image_path = choose_image()
         if image_path:
             self.selected_image_path = image_path
+            # Image logs files it cannot decode instead of raising, and
+            # caches loaded textures itself
             self.image_preview.source = image_path
             self.remove_image_button.disabled = False
 
@@ -224,30 +269,49 @@ class AddItemForm(BoxLayout):
 
     def submit_form(self, instance):
         try:
-            db = self.app.get_database()
-
-            db.add_item(
-                asset_id=self.inputs['Asset ID'].text.strip(),
-                item_name=self.inputs['Item Name'].text.strip(),
-                description=self.inputs['Description'].text.strip(),
-                location=self.inputs['Location'].text.strip(),
-                department=self.inputs['Department'].text.strip(),
-                purchase_price=float(self.inputs['Purchase Price'].text or 0),
-                quantity=int(self.inputs['Quantity'].text or 1),  # Add this line
-                condition=self.inputs['Condition'].text,
-                model_number=self.inputs['Model Number'].text.strip(),
-                serial_number=self.inputs['Serial Number'].text.strip(),
-                status=self.inputs['Status'].text
-            )
+            # Read the widgets here; the worker thread must not touch them
+            inputs = self.inputs
+            item = {
+                'asset_id': inputs['Asset ID'].text.strip(),
+                'item_name': inputs['Item Name'].text.strip(),
+                'description': inputs['Description'].text.strip(),
+                'location': inputs['Location'].text.strip(),
+                'department': inputs['Department'].text.strip(),
+                'purchase_price': _parse_numeric(inputs['Purchase Price'].text, float, 0.0),
+                'quantity': _parse_numeric(inputs['Quantity'].text, int, 1),
+                'condition': inputs['Condition'].text,
+                'model_number': inputs['Model Number'].text.strip(),
+                'serial_number': inputs['Serial Number'].text.strip(),
+                'status': inputs['Status'].text
+            }
+        except Exception as e:
+            self.show_message(str(e), 'error')
+            return
 
-            if self.selected_image_path:
-                db.add_image(self.inputs['Asset ID'].text.strip(), self.selected_image_path)
+        # Prevent double submits while the write is in flight
+        self.submit_button.disabled = True
 
-            self.clear_form()
-            self.show_message("Item added successfully!", 'success')
+        self.app.db_executor.submit(self._save_item, item, self.selected_image_path)
+
+    def _save_item(self, item, image_path):
+        """Write the item to the database on the database worker."""
+        try:
+            self.db.add_item(**item)
 
+            if image_path:
+                self.db.add_image(item['asset_id'], image_path)
+
+            Clock.schedule_once(lambda dt: self._on_submit_done("Item added successfully!", 'success'))
         except Exception as e:
-            self.show_message(str(e), 'error')
+            message = str(e)
+            Clock.schedule_once(lambda dt: self._on_submit_done(message, 'error'))
+
+    def _on_submit_done(self, message, message_type):
+        """Update the form once the background write has finished."""
+        self.submit_button.disabled = False
+        if message_type == 'success':
+            self.clear_form()
+        self.show_message(message, message_type)
 
     def clear_form(self):
         for input_field in self.inputs.values():
@@ -261,14 +325,16 @@ class AddItemForm(BoxLayout):
         self.remove_image_button.disabled = True
 
     def show_message(self, message, message_type='info'):
-        self.clear_widgets()
-        message_label = Label(
-            text=message,
-            color=self.styles['colors'][message_type],
-            size_hint_y=None,
-            height=dp(40)
-        )
-        self.add_widget(message_label)
-
-        from kivy.clock import Clock
-        Clock.schedule_once(lambda dt: self.setup_form(), 2)
\ No newline at end of file
+        if self._form_root.parent is not None:
+            self.remove_widget(self._form_root)
+        self._status_label.text = message
+        self._status_label.color = getattr(self._c, message_type, self._c.text)
+        if self._status_label.parent is None:
+            self.add_widget(self._status_label)
+
+        # Restart the timer so a newer message gets its full two seconds
+        Clock.unschedule(self._restore_form)
+        Clock.schedule_once(self._restore_form, 2)
+
+    def _restore_form(self, dt):
+        self.setup_form()
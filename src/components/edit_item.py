@@ -13,6 +13,7 @@ Created: January 2024
 
 # components/edit_item.py
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.button import Button
 from kivy.uix.label import Label
@@ -20,149 +21,71 @@ from kivy.uix.textinput import TextInput
 from kivy.uix.spinner import Spinner
 from kivy.metrics import dp
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.popup import Popup
-from kivy.core.window import Window
+from types import SimpleNamespace
+from utils.labels import sync_text_size
+from .add_item import CONDITION_VALUES, STATUS_VALUES
+
+# (label, item key, hint, height in dp, multiline, extra TextInput kwargs)
+# for each text field
+_FIELDS = (
+    ('Asset ID', 'asset_id', 'Enter asset ID', 40, False, {}),
+    ('Item Name', 'item_name', 'Enter item name', 40, False, {}),
+    ('Description', 'description', 'Enter description', 120, True, {'do_wrap': True}),
+    ('Location', 'location', 'Enter location', 40, False, {}),
+    ('Department', 'department', 'Enter department', 40, False, {}),
+    ('Purchase Price', 'purchase_price', '0.00', 40, False, {'input_filter': 'float'}),
+    ('Quantity', 'quantity', '1', 40, False, {'input_filter': 'int'}),
+    ('Model Number', 'model_number', 'Enter model number', 40, False, {}),
+    ('Serial Number', 'serial_number', 'Enter serial number', 40, False, {})
+)
+
+# (label, item key, values) for each dropdown
+_DROPDOWNS = (
+    ('Condition', 'condition', CONDITION_VALUES),
+    ('Status', 'status', STATUS_VALUES)
+)
 
 
 class EditItemForm(Popup):
+    # Form rows built per frame while the popup is opening
+    _ROWS_PER_FRAME = 3
+
     def __init__(self, item_data, **kwargs):
         super().__init__(**kwargs)
         self.item_data = item_data
         self.title = f'Edit Item: {item_data["asset_id"]}'
 
-        # Make popup 90% of window size
-        window_width = Window.width * 0.9
-        window_height = Window.height * 0.9
-        self.size = (window_width, window_height)
-        self.size_hint = (None, None)  # Disable size_hint to use explicit size
+        # Make popup 90% of window size, following window resizes
+        self.size_hint = (0.9, 0.9)
 
         self.app = App.get_running_app()
-        self.styles = self.app.get_common_styles()
+        self.db = self.app.get_database()
+        self._c = SimpleNamespace(**self.app.get_style('colors'))
+
+        # Resolve repeated lookups once for the widget build below
+        dp10 = dp(10)
+        dp40 = dp(40)
 
         # Create main layout
-        main_layout = BoxLayout(orientation='vertical', spacing=dp(10))
+        main_layout = BoxLayout(orientation='vertical', spacing=dp10)
 
         # Create scroll view for form content
         scroll = ScrollView()
-        self.form_layout = BoxLayout(
-            orientation='vertical',
-            spacing=dp(10),
+        self.form_layout = GridLayout(
+            cols=2,
+            spacing=dp10,
             padding=dp(20),
-            size_hint_y=None
+            size_hint_y=None,
+            row_default_height=dp40,
+            row_force_default=False
         )
-        self.form_layout.bind(minimum_height=self.form_layout.setter('height'))
-
-        # Fields definition with relative width calculations
-        content_width = window_width - dp(60)  # Account for padding
-        label_width = content_width * 0.2  # 20% for labels
-        input_width = content_width * 0.75  # 75% for inputs (leaving 5% for spacing)
-
-        fields = [
-            ('Asset ID', 'Enter asset ID', dp(40), False),
-            ('Item Name', 'Enter item name', dp(40), False),
-            ('Description', 'Enter description', dp(120), True),
-            ('Location', 'Enter location', dp(40), False),
-            ('Department', 'Enter department', dp(40), False),
-            ('Purchase Price', '0.00', dp(40), False),
-            ('Quantity', '1', dp(40), False),  # Add this line
-            ('Model Number', 'Enter model number', dp(40), False),
-            ('Serial Number', 'Enter serial number', dp(40), False)
-        ]
-
-        # Create input fields
-        self.inputs = {}
-
-        for field, hint, height, is_multiline in fields:
-            field_container = BoxLayout(
-                orientation='horizontal',
-                size_hint_y=None,
-                height=height + dp(10),
-                spacing=dp(10)
-            )
 
-            # Label with calculated width
-            label = Label(
-                text=field,
-                size_hint=(None, None),
-                size=(label_width, height),
-                halign='right',
-                valign='middle',
-                color=self.styles['colors']['text']
-            )
-            label.bind(size=label.setter('text_size'))
-            field_container.add_widget(label)
-
-            # Input field with calculated width
-            if field == 'Description':
-                self.inputs[field] = TextInput(
-                    text=str(item_data.get(field.lower().replace(' ', '_'), '')),
-                    multiline=True,
-                    size_hint=(None, None),
-                    size=(input_width, height),
-                    background_color=self.styles['colors']['surface'],
-                    foreground_color=self.styles['colors']['text'],
-                    padding=[dp(10), dp(10)],
-                    do_wrap=True  # Enable text wrapping
-                )
-            elif field == 'Purchase Price':
-                self.inputs[field] = TextInput(
-                    text=str(item_data.get(field.lower().replace(' ', '_'), '')),
-                    multiline=False,
-                    size_hint=(None, None),
-                    size=(input_width, height),
-                    input_filter='float',
-                    background_color=self.styles['colors']['surface'],
-                    foreground_color=self.styles['colors']['text'],
-                    padding=[dp(10), dp(10)]
-                )
-            else:
-                self.inputs[field] = TextInput(
-                    text=str(item_data.get(field.lower().replace(' ', '_'), '')),
-                    multiline=False,
-                    size_hint=(None, None),
-                    size=(input_width, height),
-                    background_color=self.styles['colors']['surface'],
-                    foreground_color=self.styles['colors']['text'],
-                    padding=[dp(10), dp(10)]
-                )
-            field_container.add_widget(self.inputs[field])
-            self.form_layout.add_widget(field_container)
-
-        # Add dropdowns
-        for field, values in [
-            ('Condition', ['New', 'Good', 'Fair', 'Poor']),
-            ('Status', ['Available', 'In Use', 'Under Maintenance', 'Retired'])
-        ]:
-            dropdown_container = BoxLayout(
-                orientation='horizontal',
-                size_hint_y=None,
-                height=dp(40),
-                spacing=dp(10)
-            )
-
-            label = Label(
-                text=field,
-                size_hint=(None, None),
-                size=(label_width, dp(40)),
-                halign='right',
-                valign='middle',
-                color=self.styles['colors']['text']
-            )
-            label.bind(size=label.setter('text_size'))
-            dropdown_container.add_widget(label)
-
-            current_value = item_data.get(field.lower(), values[0])
-            self.inputs[field] = Spinner(
-                text=current_value,
-                values=values,
-                size_hint=(None, None),
-                size=(input_width, dp(40)),
-                background_normal='',
-                background_color=self.styles['colors']['primary'],
-                color=self.styles['colors']['text']
-            )
-            dropdown_container.add_widget(self.inputs[field])
-            self.form_layout.add_widget(dropdown_container)
+        # Rows are added a few per frame so the popup opens straight away
+        self.inputs = {}
+        self._row_builder = self._build_rows()
+        Clock.schedule_interval(self._build_next_rows, 0)
 
         # Add form to scroll view
         scroll.add_widget(self.form_layout)
@@ -173,73 +96,143 @@ class EditItemForm(Popup):
             size_hint_y=None,
             height=dp(50),
             spacing=dp(20),
-            padding=[dp(20), dp(10)]
+            padding=[dp(20), dp10]
         )
 
-        # Save button
-        save_button = Button(
+        # Save button, enabled once every row has been built
+        self.save_button = Button(
             text='Save Changes',
             size_hint=(None, None),
-            size=(dp(150), dp(40)),
+            size=(dp(150), dp40),
             background_normal='',
-            background_color=self.styles['colors']['success'],
-            color=self.styles['colors']['text']
+            background_color=self._c.success,
+            color=self._c.text,
+            disabled=True
         )
-        save_button.bind(on_press=self.save_changes)
+        self.save_button.bind(on_press=self.save_changes)
 
         # Cancel button
         cancel_button = Button(
             text='Cancel',
             size_hint=(None, None),
-            size=(dp(150), dp(40)),
+            size=(dp(150), dp40),
             background_normal='',
-            background_color=self.styles['colors']['error'],
-            color=self.styles['colors']['text']
+            background_color=self._c.error,
+            color=self._c.text
         )
         cancel_button.bind(on_press=self.dismiss)
 
-        buttons_container.add_widget(save_button)
+        buttons_container.add_widget(self.save_button)
         buttons_container.add_widget(cancel_button)
         main_layout.add_widget(buttons_container)
 
         self.content = main_layout
 
+    def _build_rows(self):
+        """Add the form rows one at a time, yielding after each."""
+        # Resolved once for every row rather than per row
+        dp10 = dp(10)
+        dp40 = dp(40)
+        for field in _FIELDS:
+            self._add_field_row(*field, dp10)
+            yield
+        for dropdown in _DROPDOWNS:
+            self._add_dropdown_row(*dropdown, dp40)
+            yield
+
+    def _build_next_rows(self, dt):
+        for _ in range(self._ROWS_PER_FRAME):
+            try:
+                next(self._row_builder)
+            except StopIteration:
+                # Size the form once, after every row is in place
+                form_layout = self.form_layout
+                form_layout.bind(minimum_height=form_layout.setter('height'))
+                form_layout.height = form_layout.minimum_height
+                self.save_button.disabled = False
+                return False
+        return True
+
+    def on_dismiss(self):
+        Clock.unschedule(self._build_next_rows)
+
+    def _add_field_row(self, field, key, hint, height, is_multiline, extra, dp10):
+        height = dp(height)
+
+        # Labels and inputs split each row in a 20:75 ratio
+        label = Label(
+            text=field,
+            size_hint=(0.2, None),
+            height=height,
+            halign='right',
+            valign='middle',
+            color=self._c.text
+        )
+        label.text_size = label.size
+        label.bind(size=sync_text_size)
+        self.form_layout.add_widget(label)
+
+        self.inputs[field] = TextInput(
+            text=str(self.item_data.get(key, '')),
+            hint_text=hint,
+            multiline=is_multiline,
+            size_hint=(0.75, None),
+            height=height,
+            background_color=self._c.surface,
+            foreground_color=self._c.text,
+            padding=[dp10, dp10],
+            **extra
+        )
+        self.form_layout.add_widget(self.inputs[field])
+
+    def _add_dropdown_row(self, field, key, values, dp40):
+        label = Label(
+            text=field,
+            size_hint=(0.2, None),
+            height=dp40,
+            halign='right',
+            valign='middle',
+            color=self._c.text
+        )
+        label.text_size = label.size
+        label.bind(size=sync_text_size)
+        self.form_layout.add_widget(label)
+
+        current_value = self.item_data.get(key, values[0])
+        self.inputs[field] = Spinner(
+            text=current_value,
+            values=values,
+            size_hint=(0.75, None),
+            height=dp40,
+            background_normal='',
+            background_color=self._c.primary,
+            color=self._c.text
+        )
+        self.form_layout.add_widget(self.inputs[field])
+
     def save_changes(self, instance):
         try:
-            db = self.app.get_database()
-
-            new_asset_id = self.inputs['Asset ID'].text.strip()
+            inputs = self.inputs
+            new_asset_id = inputs['Asset ID'].text.strip()
             old_asset_id = self.item_data['asset_id']
 
-            if new_asset_id != old_asset_id:
-                db.update_asset_id(old_asset_id, new_asset_id)
-                db.update_item(
-                    new_asset_id,
-                    item_name=self.inputs['Item Name'].text.strip(),
-                    description=self.inputs['Description'].text.strip(),
-                    location=self.inputs['Location'].text.strip(),
-                    department=self.inputs['Department'].text.strip(),
-                    purchase_price=float(self.inputs['Purchase Price'].text or 0),
-                    quantity=int(self.inputs['Quantity'].text or 1),  # Add this line
-                    condition=self.inputs['Condition'].text,
-                    model_number=self.inputs['Model Number'].text.strip(),
-                    serial_number=self.inputs['Serial Number'].text.strip(),
-                    status=self.inputs['Status'].text
-                )
+            payload = {
+                key: inputs[field].text.strip()
+                for field, key, *_ in _FIELDS if key != 'asset_id'
+            }
+            payload['purchase_price'] = float(payload['purchase_price'] or 0)
+            payload['quantity'] = int(payload['quantity'] or 1)
+            for field, key, _ in _DROPDOWNS:
+                payload[key] = inputs[field].text
+
+            # Only rename when the ID really changed, not just its padding
+            if new_asset_id != old_asset_id.strip():
+                self.db.update_asset_id(old_asset_id, new_asset_id)
+                target_id = new_asset_id
             else:
-                # Normal update without changing asset ID
-                db.update_item(
-                    old_asset_id,
-                    item_name=self.inputs['Item Name'].text.strip(),
-                    description=self.inputs['Description'].text.strip(),
-                    location=self.inputs['Location'].text.strip(),
-                    department=self.inputs['Department'].text.strip(),
-                    purchase_price=float(self.inputs['Purchase Price'].text or 0),
-                    condition=self.inputs['Condition'].text,
-                    model_number=self.inputs['Model Number'].text.strip(),
-                    serial_number=self.inputs['Serial Number'].text.strip(),
-                    status=self.inputs['Status'].text
-                )
+                target_id = old_asset_id
+
+            self.db.update_item(target_id, **payload)
 
             self.dismiss()
             if hasattr(self, 'on_save_callback'):
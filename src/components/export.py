@@ -16,8 +16,17 @@ from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.metrics import dp
 from kivy.app import App
+from kivy.clock import Clock
 import os
 from datetime import datetime
+from types import SimpleNamespace
+
+# Timestamp format used in default export filenames
+_FILENAME_TIME_FORMAT = '%Y%m%d_%H%M%S'
+
+
+def _default_filename():
+    return f"inventory_export_{datetime.now().strftime(_FILENAME_TIME_FORMAT)}.csv"
 
 class ExportInterface(BoxLayout):
     def __init__(self, **kwargs):
@@ -26,22 +35,34 @@ class ExportInterface(BoxLayout):
         self.spacing = dp(15)
         self.padding = dp(20)
         
-        # Get app instance and styles
+        # Get app instance and colors
         self.app = App.get_running_app()
-        self.styles = self.app.get_common_styles()
+        self.db = self.app.get_database()
+        self._c = SimpleNamespace(**self.app.get_style('colors'))
+
+        # Bursts of refresh requests collapse into one statistics query
+        self._refresh_stats = Clock.create_trigger(self._do_update_stats_preview, 0.1)
         
         # Setup the export interface
         self.setup_interface()
     
     def setup_interface(self):
         """Create the export interface layout."""
+        # Resolve repeated lookups once for the widget build below
+        dp10 = dp(10)
+        dp30 = dp(30)
+        dp40 = dp(40)
+
+        # The form and the export result are built once and swapped in place
+        self.form_panel = BoxLayout(orientation='vertical', spacing=dp(15))
+
         # Title
-        self.add_widget(Label(
+        self.form_panel.add_widget(Label(
             text='Export Inventory Data',
             size_hint_y=None,
-            height=dp(40),
+            height=dp40,
             font_size=dp(20),
-            color=self.styles['colors']['text']
+            color=self._c.text
         ))
         
         # File name input section
@@ -55,163 +76,220 @@ class ExportInterface(BoxLayout):
         filename_layout.add_widget(Label(
             text='Export Filename:',
             size_hint_y=None,
-            height=dp(30),
-            color=self.styles['colors']['text'],
+            height=dp30,
+            color=self._c.text,
             halign='left'
         ))
         
-        # Generate default filename
-        default_filename = f"inventory_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        # Generate default filename, remembered to tell it from user edits
+        self._auto_filename = _default_filename()
         
         self.filename_input = TextInput(
-            text=default_filename,
+            text=self._auto_filename,
             multiline=False,
             size_hint_y=None,
-            height=dp(40),
-            background_color=self.styles['colors']['surface'],
-            foreground_color=self.styles['colors']['text'],
-            padding=(dp(10), dp(10))
+            height=dp40,
+            background_color=self._c.surface,
+            foreground_color=self._c.text,
+            padding=(dp10, dp10)
         )
         filename_layout.add_widget(self.filename_input)
-        self.add_widget(filename_layout)
+        self.form_panel.add_widget(filename_layout)
         
         # Stats preview
         self.stats_layout = BoxLayout(
             orientation='vertical',
             size_hint_y=None,
-            spacing=dp(10),
-            padding=[0, dp(10)],
+            spacing=dp10,
+            padding=[0, dp10],
             height=dp(150)
         )
         
         self.stats_layout.add_widget(Label(
             text='Export Preview:',
             size_hint_y=None,
-            height=dp(30),
-            color=self.styles['colors']['text'],
+            height=dp30,
+            color=self._c.text,
             halign='left'
         ))
-        
-        self.update_stats_preview()
-        self.add_widget(self.stats_layout)
+
+        # Stat rows are created once and have their text updated in place
+        row_height = dp(25)
+        self._stats_labels = []
+        for _ in range(4):
+            label = Label(
+                text='',
+                size_hint_y=None,
+                height=row_height,
+                color=self._c.text_secondary
+            )
+            self._stats_labels.append(label)
+            self.stats_layout.add_widget(label)
+        self._last_stats_key = None
+
+        self.form_panel.add_widget(self.stats_layout)
         
         # Export button
-        export_button = Button(
+        self.export_button = Button(
             text='Export to CSV',
             size_hint=(None, None),
             size=(dp(200), dp(50)),
             pos_hint={'center_x': 0.5},
             background_normal='',
-            background_color=self.styles['colors']['primary'],
-            color=self.styles['colors']['text']
+            background_color=self._c.primary,
+            color=self._c.text
         )
-        export_button.bind(on_press=self.perform_export)
-        self.add_widget(export_button)
+        self.export_button.bind(on_press=self.perform_export)
+        self.form_panel.add_widget(self.export_button)
         
         # Message area
         self.message_label = Label(
             text='',
             size_hint_y=None,
-            height=dp(40),
-            color=self.styles['colors']['text']
+            height=dp40,
+            color=self._c.text
         )
-        self.add_widget(self.message_label)
+        self.form_panel.add_widget(self.message_label)
+        self.add_widget(self.form_panel)
+
+        self.setup_result_panel()
+
+        # Needs message_label to report errors
+        self.update_stats_preview()
     
-    def update_stats_preview(self):
+    def setup_result_panel(self):
+        """Create the panel shown after a successful export."""
+        dp10 = dp(10)
+
+        self.result_panel = BoxLayout(orientation='vertical', spacing=dp(15))
+
+        success_layout = BoxLayout(
+            orientation='vertical',
+            spacing=dp10,
+            padding=dp10
+        )
+
+        success_layout.add_widget(Label(
+            text='✓ Export Successful!',
+            color=self._c.success,
+            font_size=dp(18)
+        ))
+
+        self.result_path_label = Label(
+            text='',
+            color=self._c.text,
+            font_size=dp(14)
+        )
+        success_layout.add_widget(self.result_path_label)
+        self.result_panel.add_widget(success_layout)
+
+        # Return button
+        return_button = Button(
+            text='Export Another File',
+            size_hint=(None, None),
+            size=(dp(200), dp(50)),
+            pos_hint={'center_x': 0.5},
+            background_normal='',
+            background_color=self._c.primary,
+            color=self._c.text
+        )
+        return_button.bind(on_press=self.show_form)
+        self.result_panel.add_widget(return_button)
+
+    def show_form(self, *args):
+        """Return from the export result to the export form."""
+        self.remove_widget(self.result_panel)
+        self.message_label.text = ''
+
+        # Keep a filename the user typed; refresh our own so it isn't overwritten
+        if self.filename_input.text == self._auto_filename:
+            self._auto_filename = _default_filename()
+            self.filename_input.text = self._auto_filename
+        self.add_widget(self.form_panel)
+
+    def on_parent(self, instance, parent):
+        # The interface is kept between tab switches; items may have changed
+        # since it was last shown (the trigger merges this with the first call)
+        if parent is not None:
+            self._refresh_stats()
+
+    def update_stats_preview(self, *args):
+        """Schedule a refresh of the statistics preview."""
+        self._refresh_stats()
+
+    def _do_update_stats_preview(self, dt):
+        """Fetch statistics on the database worker for the preview."""
+        future = self.app.db_executor.submit(self.db.get_statistics)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._apply_stats(f))
+        )
+
+    def _apply_stats(self, future):
         """Update the statistics preview."""
         try:
-            stats = self.app.get_database().get_statistics()
-            
-            # Clear previous stats
-            self.stats_layout.clear_widgets()
-            self.stats_layout.add_widget(Label(
-                text='Export Preview:',
-                size_hint_y=None,
-                height=dp(30),
-                color=self.styles['colors']['text'],
-                halign='left'
-            ))
-            
-            # Add stats
-            stats_text = [
-                f"Total Items: {stats['total_items']}",
-                f"Total Value: ${stats['total_value']:.2f}",
-                f"Departments: {len(stats['items_by_department'])}",
-                f"Conditions: {len(stats['items_by_condition'])}"
-            ]
-            
-            for text in stats_text:
-                self.stats_layout.add_widget(Label(
-                    text=text,
-                    size_hint_y=None,
-                    height=dp(25),
-                    color=self.styles['colors']['text_secondary']
-                ))
-                
+            stats = future.result()
         except Exception as e:
             self.show_message(f"Error loading preview: {str(e)}", 'error')
+            return
+
+        # Nothing to redraw if the summary is unchanged
+        stats_key = (
+            stats['total_items'],
+            stats['total_value'],
+            len(stats['items_by_department']),
+            len(stats['items_by_condition'])
+        )
+        if stats_key == self._last_stats_key:
+            return
+        self._last_stats_key = stats_key
+
+        stats_text = (
+            f"Total Items: {stats['total_items']}",
+            f"Total Value: ${stats['total_value']:.2f}",
+            f"Departments: {len(stats['items_by_department'])}",
+            f"Conditions: {len(stats['items_by_condition'])}"
+        )
+        for label, text in zip(self._stats_labels, stats_text):
+            label.text = text
     
     def perform_export(self, instance):
-        """Execute the export operation."""
+        """Start the export on the database worker."""
+        filename = self.filename_input.text.strip()
+        
+        # Validate filename
+        if not filename:
+            self.show_message("Please enter a filename", 'error')
+            return
+        
+        if not filename.endswith('.csv'):
+            filename += '.csv'
+
+        # Scanning and writing the whole inventory would freeze the UI; run
+        # it on the worker and guard against a second press meanwhile
+        self.export_button.disabled = True
+        self.show_message('Exporting...')
+        future = self.app.db_executor.submit(self.db.export_to_csv, filename)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._on_export_done(f))
+        )
+
+    def _on_export_done(self, future):
+        self.export_button.disabled = False
         try:
-            filename = self.filename_input.text.strip()
-            
-            # Validate filename
-            if not filename:
-                raise ValueError("Please enter a filename")
-            
-            if not filename.endswith('.csv'):
-                filename += '.csv'
-            
-            # Perform export
-            filepath = self.app.get_database().export_to_csv(filename)
-            
-            # Show success message with file path
-            success_layout = BoxLayout(
-                orientation='vertical',
-                spacing=dp(10),
-                padding=dp(10)
-            )
-            
-            success_layout.add_widget(Label(
-                text='✓ Export Successful!',
-                color=self.styles['colors']['success'],
-                font_size=dp(18)
-            ))
-            
-            success_layout.add_widget(Label(
-                text=f'File saved as:\n{os.path.abspath(filepath)}',
-                color=self.styles['colors']['text'],
-                font_size=dp(14)
-            ))
-            
-            # Clear current widgets and show success
-            self.clear_widgets()
-            self.add_widget(success_layout)
-            
-            # Add return button
-            return_button = Button(
-                text='Export Another File',
-                size_hint=(None, None),
-                size=(dp(200), dp(50)),
-                pos_hint={'center_x': 0.5},
-                background_normal='',
-                background_color=self.styles['colors']['primary'],
-                color=self.styles['colors']['text']
-            )
-            return_button.bind(on_press=lambda x: self.setup_interface())
-            self.add_widget(return_button)
-            
+            filepath = future.result()
         except Exception as e:
             self.show_message(str(e), 'error')
+            return
+
+        # Show success message with file path
+        self.message_label.text = ''
+        self.result_path_label.text = f'File saved as:\n{os.path.abspath(filepath)}'
+        self.remove_widget(self.form_panel)
+        self.add_widget(self.result_panel)
     
     def show_message(self, message, message_type='info'):
         """Display a message to the user."""
-        color = {
-            'success': self.styles['colors']['success'],
-            'error': self.styles['colors']['error'],
-            'info': self.styles['colors']['text']
-        }.get(message_type, self.styles['colors']['text'])
-        
+        color = getattr(self._c, message_type, self._c.text)
+
         self.message_label.text = message
         self.message_label.color = color 
@@ -19,16 +19,41 @@ from kivy.uix.label import Label
 from kivy.metrics import dp
 from kivy.core.image import Image as CoreImage
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.logger import Logger
 import io
+from collections import OrderedDict
+from types import SimpleNamespace
 from utils.file_chooser import choose_image
 
+# Leading bytes of each image format the file chooser offers
+_MAGIC_EXTENSIONS = (
+    (b'\x89PNG', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF8', 'gif'),
+    (b'BM', 'bmp')
+)
+
+
+def _ext_of(image_data):
+    """Return the file extension matching the image data's format."""
+    for magic, ext in _MAGIC_EXTENSIONS:
+        if image_data.startswith(magic):
+            return ext
+    return 'png'
+
 
 class ImageViewer(Popup):
+    # asset_id -> (image version, texture), oldest first
+    _tex_cache = OrderedDict()
+    _TEX_CACHE_SIZE = 16
+
     def __init__(self, asset_id, **kwargs):
         super().__init__(**kwargs)
         self.asset_id = asset_id
         self.app = App.get_running_app()
-        self.styles = self.app.get_common_styles()
+        self.db = self.app.get_database()
+        self._c = SimpleNamespace(**self.app.get_style('colors'))
 
         self.title = f'Image Viewer - {asset_id}'
         self.size_hint = (0.8, 0.8)
@@ -55,8 +80,8 @@ class ImageViewer(Popup):
             text='Add/Change Image',
             size_hint_x=0.5,
             background_normal='',
-            background_color=self.styles['colors']['primary'],
-            color=self.styles['colors']['text']
+            background_color=self._c.primary,
+            color=self._c.text
         )
         self.add_button.bind(on_press=self.select_image)
         button_layout.add_widget(self.add_button)
@@ -66,8 +91,8 @@ class ImageViewer(Popup):
             text='Remove Image',
             size_hint_x=0.5,
             background_normal='',
-            background_color=self.styles['colors']['error'],
-            color=self.styles['colors']['text']
+            background_color=self._c.error,
+            color=self._c.text
         )
         self.remove_button.bind(on_press=self.remove_image)
         button_layout.add_widget(self.remove_button)
@@ -79,45 +104,95 @@ class ImageViewer(Popup):
         self.load_image()
 
     def load_image(self):
-        """Load image from database."""
+        """Load image from database without blocking the UI."""
+        self.app.db_executor.submit(self._fetch_image)
+
+    def _fetch_image(self):
+        """Fetch and decode the image on the database worker."""
         try:
-            image_data = self.app.get_database().get_image(self.asset_id)
-            if image_data:
-                data = io.BytesIO(image_data)
-                img = CoreImage(data, ext='png')
-                self.image_display.texture = img.texture
-                self.remove_button.disabled = False
-            else:
-                self.image_display.source = ''
-                self.remove_button.disabled = True
+            # A matching version lets us skip downloading the image at all
+            version = self.db.get_image_version(self.asset_id)
+            cached = self._tex_cache.get(self.asset_id)
+            if version is not None and cached and cached[0] == version:
+                Clock.schedule_once(lambda dt: self._show_texture(cached[1]))
+                return
+
+            image_data = self.db.get_image(self.asset_id)
+            if not image_data:
+                Clock.schedule_once(lambda dt: self._show_texture(None))
+                return
+
+            # Images stored before versioning are identified by their bytes
+            if version is None:
+                version = hash(image_data)
+                if cached and cached[0] == version:
+                    Clock.schedule_once(lambda dt: self._show_texture(cached[1]))
+                    return
+
+            # Decoding happens here; the texture is created on the main thread
+            img = CoreImage(io.BytesIO(image_data), ext=_ext_of(image_data))
+            Clock.schedule_once(lambda dt: self._apply_image(version, img))
         except Exception as e:
-            print(f"Error loading image: {e}")
+            Logger.error(f"ImageViewer: Error loading image: {e}")
+
+    def _apply_image(self, version, img):
+        texture = img.texture
+        cache = self._tex_cache
+        cache[self.asset_id] = (version, texture)
+        cache.move_to_end(self.asset_id)
+        if len(cache) > self._TEX_CACHE_SIZE:
+            cache.popitem(last=False)
+        self._show_texture(texture)
+
+    def _show_texture(self, texture):
+        self.image_display.texture = texture
+        self.remove_button.disabled = texture is None
 
     def select_image(self, instance):
         """Open native file dialog to select an image."""
         image_path = choose_image()
         if image_path:
-            try:
-                self.app.get_database().add_image(self.asset_id, image_path)
-                self.load_image()
-            except Exception as e:
-                error_popup = Popup(
-                    title='Error',
-                    content=Label(text=str(e)),
-                    size_hint=(0.6, 0.3)
-                )
-                error_popup.open()
+            # Resizing and uploading run on the database worker; guard
+            # against starting a second upload meanwhile
+            self.add_button.disabled = True
+            future = self.app.db_executor.submit(self.db.add_image, self.asset_id, image_path)
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self._on_image_added(f))
+            )
+
+    def _on_image_added(self, future):
+        self.add_button.disabled = False
+        try:
+            future.result()
+        except Exception as e:
+            self._show_error(str(e))
+            return
+        self._tex_cache.pop(self.asset_id, None)
+        self.load_image()
 
     def remove_image(self, instance):
         """Remove image from database."""
+        # Deleting the GridFS file runs on the database worker
+        self.remove_button.disabled = True
+        future = self.app.db_executor.submit(self.db.remove_image, self.asset_id)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._on_image_removed(f))
+        )
+
+    def _on_image_removed(self, future):
         try:
-            self.app.get_database().remove_image(self.asset_id)
-            self.image_display.source = ''
-            self.remove_button.disabled = True
+            future.result()
         except Exception as e:
-            error_popup = Popup(
-                title='Error',
-                content=Label(text=str(e)),
-                size_hint=(0.6, 0.3)
-            )
-            error_popup.open()
\ No newline at end of file
+            self.remove_button.disabled = False
+            self._show_error(str(e))
+            return
+        self._tex_cache.pop(self.asset_id, None)
+        self._show_texture(None)
+
+    def _show_error(self, message):
+        error_popup = Popup(
+            title='Error',
+            content=Label(text=message),
+            size_hint=(0.6, 0.3)
+        )
+        error_popup.open()
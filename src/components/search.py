@@ -12,208 +12,134 @@ Created: January 2024
 """
 # components/search.py
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.metrics import dp
 from kivy.app import App
 from kivy.graphics import Color, Rectangle
+from kivy.clock import Clock
+from pymongo.errors import AutoReconnect, ServerSelectionTimeoutError
+from collections import OrderedDict
+import random
+from functools import partial
+from types import SimpleNamespace
+from utils.labels import sync_text_size
+from .edit_item import EditItemForm
 from .image_viewer import ImageViewer
 
-class SearchInterface(BoxLayout):
+
+class ResultCard(RecycleDataViewBehavior, BoxLayout):
+    """Card for one search result, recycled by the results RecycleView.
+
+    The widget tree is built once; refresh_view_attrs only rebinds text
+    to whichever item the card is showing.
+    """
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        dp10 = dp(10)
+        dp25 = dp(25)
+        dp30 = dp(30)
+        dp60 = dp(60)
         self.orientation = 'vertical'
-        self.spacing = dp(10)
-        self.padding = dp(10)
-        
-        self.app = App.get_running_app()
-        self.styles = self.app.get_common_styles()
-        
-        self.setup_interface()
-    
-    def setup_interface(self):
-        self.add_widget(Label(
-            text='Search Inventory',
-            size_hint_y=None,
-            height=dp(40),
-            font_size=dp(20),
-            color=self.styles['colors']['text']
-        ))
-        
-        search_layout = BoxLayout(
-            size_hint_y=None,
-            height=dp(50),
-            spacing=dp(10),
-            padding=[0, dp(5)]
-        )
-        
-        self.search_input = TextInput(
-            multiline=False,
-            hint_text='Enter search term...',
-            size_hint=(0.7, None),
-            height=dp(40),
-            background_color=self.styles['colors']['surface'],
-            foreground_color=self.styles['colors']['text'],
-            padding=(dp(10), dp(10))
-        )
-        self.search_input.bind(on_text_validate=self.perform_search)
-        search_layout.add_widget(self.search_input)
-        
-        search_button = Button(
-            text='Search',
-            size_hint=(0.3, None),
-            height=dp(40),
-            background_normal='',
-            background_color=self.styles['colors']['primary'],
-            color=self.styles['colors']['text']
-        )
-        search_button.bind(on_press=self.perform_search)
-        search_layout.add_widget(search_button)
-        
-        self.add_widget(search_layout)
-        
-        self.results_scroll = ScrollView(size_hint=(1, 1))
-        self.results_grid = GridLayout(
-            cols=1,
-            spacing=dp(10),
-            size_hint_y=None,
-            padding=dp(5)
-        )
-        self.results_grid.bind(minimum_height=self.results_grid.setter('height'))
-        self.results_scroll.add_widget(self.results_grid)
-        self.add_widget(self.results_scroll)
+        self.padding = dp10
+        self.spacing = dp(5)
 
-    def perform_search(self, instance):
-        self.results_grid.clear_widgets()
-        results = self.app.get_database().search_items(self.search_input.text)
-        
-        if not results:
-            self.results_grid.add_widget(Label(
-                text='No items found',
-                color=self.styles['colors']['text'],
-                size_hint_y=None,
-                height=dp(40)
-            ))
-            return
-            
-        self.results_grid.add_widget(Label(
-            text=f'Found {len(results)} item(s)',
-            color=self.styles['colors']['text'],
-            size_hint_y=None,
-            height=dp(30)
-        ))
-        
-        for item in results:
-            self.add_result_card(item)
+        self._c = SimpleNamespace(**App.get_running_app().get_style('colors'))
+        self._item = None
+        self._search = None
 
-    def add_result_card(self, item):
-        card = BoxLayout(
-            orientation='vertical',
-            size_hint_y=None,
-            height=dp(180),
-            padding=dp(10),
-            spacing=dp(5)
-        )
-        
-        with card.canvas.before:
-            Color(*self.styles['colors']['surface'])
-            self.rect = Rectangle(pos=card.pos, size=card.size)
-        card.bind(pos=self._update_rect, size=self._update_rect)
+        # Background, plus a separator bar centred in the gap below the card
+        # (SearchInterface spaces cards 2 * gap + height apart)
+        self._sep_gap = dp10
+        self._sep_height = dp(2)
+        with self.canvas.before:
+            Color(*self._c.surface)
+            self._bg_rect = Rectangle(pos=self.pos, size=self.size)
+            self._sep_rect = Rectangle()
+        self.bind(pos=self._update_rect, size=self._update_rect)
 
         # Header with ID and Name
         header = BoxLayout(
             size_hint_y=None,
-            height=dp(30)
+            height=dp30
         )
-        
-        id_label = Label(
-            text=f"ID: {item['asset_id']}",
+
+        self._id_lbl = Label(
             bold=True,
-            color=self.styles['colors']['primary'],
+            color=self._c.primary,
             size_hint_x=0.3
         )
-        header.add_widget(id_label)
-        
-        name_label = Label(
-            text=item['item_name'],
+        header.add_widget(self._id_lbl)
+
+        self._name_lbl = Label(
             bold=True,
-            color=self.styles['colors']['text'],
+            color=self._c.text,
             size_hint_x=0.7,
-            text_size=(None, dp(30)),
+            text_size=(None, dp30),
             halign='left',
             valign='middle',
             shorten=True,
             shorten_from='right'
         )
-        header.add_widget(name_label)
-        card.add_widget(header)
-        
+        header.add_widget(self._name_lbl)
+        self.add_widget(header)
+
         # Description with wrapping
-        desc_label = Label(
-            text=item['description'] or "No description available",
-            color=self.styles['colors']['text_secondary'],
+        self._desc_lbl = Label(
+            color=self._c.text_secondary,
             size_hint_y=None,
-            height=dp(60),
-            text_size=(card.width - dp(20), dp(60)),
+            height=dp60,
             halign='left',
             valign='top'
         )
-        card.bind(width=lambda instance, value: setattr(
-            desc_label, 'text_size', (value - dp(20), dp(60))
-        ))
-        card.add_widget(desc_label)
-        
+        self._desc_lbl.bind(size=sync_text_size)
+        self.add_widget(self._desc_lbl)
+
         # Location and Department
-        loc_dept = Label(
-            text=f"Location: {item['location'] or 'N/A'} | Department: {item['department'] or 'N/A'}",
-            color=self.styles['colors']['text'],
+        self._loc_lbl = Label(
+            color=self._c.text,
             size_hint_y=None,
-            height=dp(25),
-            text_size=(card.width - dp(20), dp(25)),
+            height=dp25,
             halign='left',
             valign='middle'
         )
-        card.bind(width=lambda instance, value: setattr(
-            loc_dept, 'text_size', (value - dp(20), dp(25))
-        ))
-        card.add_widget(loc_dept)
-        
+        self._loc_lbl.bind(size=sync_text_size)
+        self.add_widget(self._loc_lbl)
+
         # Status and Condition
-        status_cond = Label(
-            text=f"Status: {item['status'] or 'N/A'} | Condition: {item['condition'] or 'N/A'} | Quantity: {item.get('quantity', 1)}",
-            color=self.styles['colors']['text'],
+        self._status_lbl = Label(
+            color=self._c.text,
             size_hint_y=None,
-            height=dp(25),
-            text_size=(card.width - dp(20), dp(25)),
+            height=dp25,
             halign='left',
             valign='middle'
         )
+        self._status_lbl.bind(size=sync_text_size)
+        self.add_widget(self._status_lbl)
 
-        card.bind(width=lambda instance, value: setattr(
-            status_cond, 'text_size', (value - dp(20), dp(25))
-        ))
-        card.add_widget(status_cond)
-        
         # Buttons container
         buttons_box = BoxLayout(
             size_hint_y=None,
-            height=dp(30),
-            spacing=dp(10)
+            height=dp30,
+            spacing=dp10
         )
 
+        # Buttons are bound once and act on whichever item the card holds
         # Edit button
         edit_button = Button(
             text='Edit Item',
             size_hint_x=0.33,  # Changed from 0.5 to 0.33
             background_normal='',
-            background_color=self.styles['colors']['primary'],
-            color=self.styles['colors']['text']
+            background_color=self._c.primary,
+            color=self._c.text
         )
-        edit_button.bind(on_press=lambda x: self.show_edit_form(item))
+        edit_button.bind(on_press=partial(self._dispatch, 'show_edit_form'))
         buttons_box.add_widget(edit_button)
 
         # Image button
@@ -221,10 +147,10 @@ class SearchInterface(BoxLayout):
             text='View/Add Image',
             size_hint_x=0.33,  # Changed from 0.5 to 0.33
             background_normal='',
-            background_color=self.styles['colors']['primary'],
-            color=self.styles['colors']['text']
+            background_color=self._c.primary,
+            color=self._c.text
         )
-        image_button.bind(on_press=lambda x: self.show_image_viewer(item))
+        image_button.bind(on_press=partial(self._dispatch, 'show_image_viewer'))
         buttons_box.add_widget(image_button)
 
         # Delete button
@@ -232,98 +158,346 @@ class SearchInterface(BoxLayout):
             text='Delete Item',
             size_hint_x=0.33,  # Changed from 0.5 to 0.33
             background_normal='',
-            background_color=self.styles['colors']['error'],
-            color=self.styles['colors']['text']
+            background_color=self._c.error,
+            color=self._c.text
         )
-        delete_button.bind(on_press=lambda x: self.confirm_delete(item))
+        delete_button.bind(on_press=partial(self._dispatch, 'confirm_delete'))
         buttons_box.add_widget(delete_button)
+
+        self.add_widget(buttons_box)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """Point the card at data['item'], updating only its label text."""
+        item = data['item']
+        self._search = rv.search_interface
+        self._item = item
+        self._id_lbl.text = f"ID: {item['asset_id']}"
+        self._name_lbl.text = item['item_name']
+        self._desc_lbl.text = item['description'] or "No description available"
+        self._loc_lbl.text = f"Location: {item['location'] or 'N/A'} | Department: {item['department'] or 'N/A'}"
+        self._status_lbl.text = f"Status: {item['status'] or 'N/A'} | Condition: {item['condition'] or 'N/A'} | Quantity: {item.get('quantity', 1)}"
+
+    def _dispatch(self, action, instance):
+        """Run a SearchInterface action on the item the card currently holds."""
+        getattr(self._search, action)(self._item)
+
+    def _update_rect(self, instance, value):
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+        self._sep_rect.pos = (self.x, self.y - self._sep_gap - self._sep_height)
+        self._sep_rect.size = (self.width, self._sep_height)
+
+
+class SearchInterface(BoxLayout):
+    _RESULT_CACHE_SIZE = 8
+    _MAX_SEARCH_RETRIES = 2
+    _RETRY_BASE_DELAY = 0.5
+    _RETRY_MAX_DELAY = 5.0
+    _RESULTS_PER_BATCH = 20
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.spacing = dp(10)
+        self.padding = dp(10)
+        
+        self.app = App.get_running_app()
+        self.db = self.app.get_database()
+        self._c = SimpleNamespace(**self.app.get_style('colors'))
+        self._result_cache = OrderedDict()
+        self._retry_count = 0
+        self._search_future = None
+        self._search_term = None
+        self._search_generation = 0
+        self._shown_results = None
+        self._delete_popup = None
+        self._delete_target = None
+        self._error_popup = None
+        
+        self.setup_interface()
+    
+    def setup_interface(self):
+        dp10 = dp(10)
+        dp40 = dp(40)
+        self.add_widget(Label(
+            text='Search Inventory',
+            size_hint_y=None,
+            height=dp40,
+            font_size=dp(20),
+            color=self._c.text
+        ))
+        
+        search_layout = BoxLayout(
+            size_hint_y=None,
+            height=dp(50),
+            spacing=dp10,
+            padding=[0, dp(5)]
+        )
+        
+        self.search_input = TextInput(
+            multiline=False,
+            hint_text='Enter search term...',
+            size_hint=(0.7, None),
+            height=dp40,
+            background_color=self._c.surface,
+            foreground_color=self._c.text,
+            padding=(dp10, dp10)
+        )
+        self.search_input.bind(on_text_validate=self.perform_search)
+        search_layout.add_widget(self.search_input)
         
-        card.add_widget(buttons_box)
+        search_button = Button(
+            text='Search',
+            size_hint=(0.3, None),
+            height=dp40,
+            background_normal='',
+            background_color=self._c.primary,
+            color=self._c.text
+        )
+        search_button.bind(on_press=self.perform_search)
+        search_layout.add_widget(search_button)
         
-        self.results_grid.add_widget(card)
+        self.add_widget(search_layout)
         
-        # Add separator
-        separator = BoxLayout(
+        self._count_label = Label(
+            color=self._c.text,
             size_hint_y=None,
-            height=dp(2),
-            padding=[dp(20), 0]
+            height=dp(30)
         )
-        with separator.canvas:
-            Color(*self.styles['colors']['surface'])
-            Rectangle(pos=separator.pos, size=separator.size)
-        self.results_grid.add_widget(separator)
+
+        # Only the cards in view exist; scrolling rebinds them to other items
+        self.results_rv = RecycleView(viewclass=ResultCard, size_hint=(1, 1))
+        self.results_rv.search_interface = self
+        results_layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, dp(180)),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=dp(22),  # Room for each card's separator bar
+            padding=dp(5)
+        )
+        results_layout.bind(minimum_height=results_layout.setter('height'))
+        self.results_rv.add_widget(results_layout)
+        self.add_widget(self.results_rv)
+
+    def perform_search(self, instance):
+        term = self.search_input.text
+        # Enter followed by the Search button asks for the same search twice
+        if self._search_future is not None and term == self._search_term:
+            return
+        self._cancel_search()
+        results = self._result_cache.get(term)
+        if results is not None:
+            self._result_cache.move_to_end(term)
+            self.show_results(results)
+            return
+
+        # Read the cursor on the database worker and stream cards in as
+        # batches arrive, instead of blocking the UI for the whole result set
+        self._search_term = term
+        self._search_items = []
+        self._clear_results()
+        self._set_count_text('Searching...')
+        generation = self._search_generation
+        self._search_future = self.app.db_executor.submit(
+            self._fetch_results, term, generation
+        )
+        self._search_future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._on_search_done(generation, f))
+        )
+
+    def _fetch_results(self, term, generation):
+        """Read search results on the worker, posting them back in batches."""
+        batch = []
+        for item in self.db.iter_search_items(term):
+            if generation != self._search_generation:
+                return  # Superseded by a newer search
+            batch.append(item)
+            if len(batch) == self._RESULTS_PER_BATCH:
+                Clock.schedule_once(partial(self._add_results, generation, batch))
+                batch = []
+        if batch:
+            Clock.schedule_once(partial(self._add_results, generation, batch))
+
+    def _add_results(self, generation, batch, dt):
+        if generation != self._search_generation:
+            return
+        self._search_items.extend(batch)
+        self.results_rv.data.extend({'item': item} for item in batch)
+
+    def _on_search_done(self, generation, future):
+        if generation != self._search_generation:
+            return
+        self._search_future = None
+        try:
+            future.result()
+        except (ServerSelectionTimeoutError, AutoReconnect):
+            # Transient network trouble; try again shortly before giving up
+            if self._retry_count < self._MAX_SEARCH_RETRIES:
+                # Exponential backoff with jitter so clients recovering from
+                # the same outage don't retry in lockstep
+                delay = min(self._RETRY_MAX_DELAY,
+                            self._RETRY_BASE_DELAY * 2 ** self._retry_count)
+                Clock.schedule_once(self._retry_search, delay * random.uniform(0.5, 1.5))
+                self._retry_count += 1
+                return
+            self._retry_count = 0
+            self._clear_results()
+            self.show_error('Unable to reach the database. Please try again.')
+            return
+        except Exception as e:
+            self._retry_count = 0
+            self._clear_results()
+            self.show_error(f'Search failed: {str(e)}')
+            return
+
+        results = self._search_items
+        self._shown_results = results
+        self._retry_count = 0
+        self._result_cache[self._search_term] = results
+        if len(self._result_cache) > self._RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        self._set_count(len(results))
+
+    def _retry_search(self, dt):
+        self.perform_search(None)
+
+    def _cancel_search(self):
+        # Results still in flight from the worker are ignored
+        self._search_generation += 1
+        if self._search_future is not None:
+            self._search_future.cancel()
+        self._search_future = None
+
+    def on_parent(self, instance, parent):
+        # The interface is detached when another tab is shown; stop any
+        # pending retry and let an in-flight search wind down unused
+        if parent is None:
+            Clock.unschedule(self._retry_search)
+            self._cancel_search()
+        elif self._search_term is not None:
+            # Shown again; items may have changed in the other tabs
+            self.refresh_search()
+
+    def show_error(self, message):
+        """Show an error in place of the result count."""
+        self._set_count_text(message)
+        self._count_label.color = self._c.error
+
+    def show_results(self, results):
+        """Show result cards for results."""
+        # A repeat search served from the cache may already be on screen
+        if results is self._shown_results:
+            return
+        self._shown_results = results
+        self.results_rv.data = [{'item': item} for item in results]
+        self._set_count(len(results))
+
+    def _clear_results(self):
+        self._shown_results = None
+        self.results_rv.data = []
+
+    def _set_count(self, count):
+        if count:
+            self._set_count_text(f'Found {count} item(s)')
+        else:
+            self._set_count_text('No items found', dp(40))
+
+    def _set_count_text(self, text, height=None):
+        if self._count_label.parent is None:
+            # Just above the results list
+            self.add_widget(self._count_label, index=1)
+        self._count_label.text = text
+        self._count_label.height = height or dp(30)
+        self._count_label.color = self._c.text
 
     def show_edit_form(self, item):
-        from .edit_item import EditItemForm
         edit_popup = EditItemForm(item)
         edit_popup.on_save_callback = self.refresh_search
         edit_popup.open()
     
     def confirm_delete(self, item):
-        content = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
+        # The popup is built on first use and reused for every card
+        if self._delete_popup is None:
+            self._build_delete_popup()
+        self._delete_target = item
+        self._delete_msg.text = f'Are you sure you want to delete item {item["asset_id"]}?'
+        self._delete_confirm_btn.disabled = False
+        self._delete_popup.open()
+
+    def _build_delete_popup(self):
+        dp10 = dp(10)
+        content = BoxLayout(orientation='vertical', padding=dp10, spacing=dp10)
         
-        content.add_widget(Label(
-            text=f'Are you sure you want to delete item {item["asset_id"]}?',
-            color=self.styles['colors']['text']
-        ))
+        self._delete_msg = Label(color=self._c.text)
+        content.add_widget(self._delete_msg)
         
-        buttons = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(10))
+        buttons = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp10)
         
         # Confirm button
-        confirm_btn = Button(
+        self._delete_confirm_btn = Button(
             text='Delete',
             background_normal='',
-            background_color=self.styles['colors']['error'],
-            color=self.styles['colors']['text']
+            background_color=self._c.error,
+            color=self._c.text
         )
         
         # Cancel button
         cancel_btn = Button(
             text='Cancel',
             background_normal='',
-            background_color=self.styles['colors']['primary'],
-            color=self.styles['colors']['text']
+            background_color=self._c.primary,
+            color=self._c.text
         )
         
-        buttons.add_widget(confirm_btn)
+        buttons.add_widget(self._delete_confirm_btn)
         buttons.add_widget(cancel_btn)
         content.add_widget(buttons)
         
-        popup = Popup(
+        self._delete_popup = Popup(
             title='Confirm Delete',
             content=content,
             size_hint=(0.4, 0.3),
-            background_color=self.styles['colors']['surface']
+            background_color=self._c.surface
         )
         
-        def delete_item(instance):
-            try:
-                self.app.get_database().delete_item(item['asset_id'])
-                popup.dismiss()
-                self.refresh_search()
-            except Exception as e:
-                popup.dismiss()
-                error_popup = Popup(
-                    title='Error',
-                    content=Label(text=str(e)),
-                    size_hint=(0.6, 0.3)
-                )
-                error_popup.open()
-        
-        confirm_btn.bind(on_press=delete_item)
-        cancel_btn.bind(on_press=popup.dismiss)
-        
-        popup.open()
+        self._delete_confirm_btn.bind(on_press=self._do_delete)
+        cancel_btn.bind(on_press=self._delete_popup.dismiss)
+
+    def _do_delete(self, instance):
+        # Delete on the database worker; guard against a double press
+        self._delete_confirm_btn.disabled = True
+        future = self.app.db_executor.submit(self.db.delete_item, self._delete_target['asset_id'])
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._on_delete_done(f))
+        )
+
+    def _on_delete_done(self, future):
+        self._delete_popup.dismiss()
+        try:
+            future.result()
+        except Exception as e:
+            self.show_error_popup(str(e))
+        else:
+            self.refresh_search()
+
+    def show_error_popup(self, message):
+        """Show message in a reusable error popup."""
+        if self._error_popup is None:
+            self._error_popup = Popup(
+                title='Error',
+                content=Label(),
+                size_hint=(0.6, 0.3)
+            )
+        self._error_popup.content.text = message
+        self._error_popup.open()
 
     def refresh_search(self):
+        # Called after edits and deletes, so cached results are stale
+        self._result_cache.clear()
+        self._cancel_search()
         self.perform_search(None)
     
-    def _update_rect(self, instance, value):
-        instance.canvas.before.clear()
-        with instance.canvas.before:
-            Color(*self.styles['colors']['surface'])
-            Rectangle(pos=instance.pos, size=instance.size)
-
     def show_image_viewer(self, item):
         """Show image viewer popup."""
         image_viewer = ImageViewer(item['asset_id'])
@@ -15,43 +15,98 @@ from datetime import datetime
 import time
 from datetime import timezone
 from datetime import timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import csv
+import hashlib
+import io
 import os
+import re
 from pymongo import MongoClient
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
+from pymongo.errors import ConnectionFailure, DuplicateKeyError, OperationFailure
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; images are stored as-is without it
+    Image = None
+
+# Stored images are scaled down to fit within this size
+MAX_IMAGE_SIZE = (1600, 1600)
+
+# Seconds to reuse computed statistics while the inventory is unchanged
+STATS_TTL = 30
+
+# Server error codes meaning the username or password was rejected
+# (UserNotFound, AuthenticationFailed, and Atlas's AtlasError "bad auth")
+AUTH_CODES = (11, 18, 8000)
+
+# CSV export columns, in order
+EXPORT_FIELDS = (
+    'asset_id', 'item_name', 'description', 'location', 'department',
+    'purchase_price', 'condition', 'model_number', 'serial_number',
+    'status', 'quantity', 'notes', 'last_updated'
+)
+
+try:
+    EASTERN = ZoneInfo('America/New_York')
+except ZoneInfoNotFoundError:  # No tz database (e.g. Windows without tzdata)
+    EASTERN = timezone(timedelta(hours=-5))
 
 
 class InventoryDatabase:
-    def __init__(self, connection_string):
-        """Initialize the MongoDB connection."""
+    def __init__(self, connection_string, max_pool_size=50, min_pool_size=1,
+                 **client_options):
+        """Initialize the MongoDB connection.
+
+        Extra keyword arguments are passed straight to MongoClient.
+        """
+        # (computed at, statistics) from the last get_statistics call
+        self._stats_cache = (0.0, None)
+        self._time_cache = (0, '')
+
         try:
-            self.client = MongoClient(connection_string)
+            # Keep a warm connection open so operations don't reconnect
+            self.client = MongoClient(
+                connection_string,
+                maxPoolSize=max_pool_size,
+                minPoolSize=min_pool_size,
+                **client_options
+            )
             self.db = self.client.inventory_db
             self.inventory = self.db.inventory_items
+            self.images = GridFSBucket(self.db, bucket_name='images')
 
-            # Test connection
-            self.client.server_info()
-
-            # Create indexes
+            # Creating the index is also the connection test: it is the first
+            # round trip, so bad credentials or no network fail here.
+            # createIndexes is a no-op when the index already exists
             self.inventory.create_index('asset_id', unique=True)
 
-        except Exception as e:
+        except OperationFailure as e:
+            if e.code in AUTH_CODES:
+                raise Exception("Invalid credentials. Please check your username and password.")
+            # e.g. missing privileges or a conflicting index; say what failed
+            message = (e.details or {}).get('errmsg') or str(e)
+            raise Exception(f"Database error: {message}")
+        except ConnectionFailure:
+            raise Exception("Unable to connect to database. Please check your network connection.")
+        except Exception:
             raise Exception("Failed to connect to database. Please check your credentials.")
 
     def get_formatted_time(self):
-        """Get current time in EST format."""
-        # Get current UTC time
-        utc_time = datetime.now(timezone.utc)
-
-        # Convert to EST (UTC-5)
-        est_offset = timedelta(hours=-5)
-        est_time = utc_time + est_offset
-
-        # Format time
-        return est_time.strftime("%d/%m/%Y %H:%M:%S")
+        """Get current US Eastern time (DST aware) as a display string."""
+        # Writes in the same second share one formatted string
+        now_s = int(time.time())
+        cached_s, cached_str = self._time_cache
+        if now_s == cached_s:
+            return cached_str
+        formatted = datetime.fromtimestamp(now_s, EASTERN).strftime("%d/%m/%Y %H:%M:%S")
+        self._time_cache = (now_s, formatted)
+        return formatted
 
     def add_item(self, asset_id, item_name, description="", location="", department="",
                  purchase_price=0.0, condition="New", model_number="", serial_number="",
-                 status="Available", notes=""):
+                 status="Available", quantity=1, notes=""):
         """Add a new item to the inventory."""
         try:
             self.validate_asset_id(asset_id)
@@ -73,37 +128,42 @@ class InventoryDatabase:
             }
 
             self.inventory.insert_one(item)
+            self.invalidate_stats()
             return True
 
+        except DuplicateKeyError:
+            raise ValueError(f"Error adding item: Asset ID {asset_id} already exists")
         except Exception as e:
             raise ValueError(f"Error adding item: {str(e)}")
 
     def update_item(self, asset_id, **kwargs):
         """Update an existing item's details."""
-        if not self.get_item(asset_id):
-            raise ValueError(f"Asset ID {asset_id} not found")
-
-        # Add last_updated timestamp in EST
+        # Add last_updated timestamp in Eastern time
         kwargs['last_updated'] = self.get_formatted_time()
 
         try:
-            self.inventory.update_one(
+            # One round trip; matched_count says whether the item exists
+            result = self.inventory.update_one(
                 {'asset_id': asset_id},
                 {'$set': kwargs}
             )
-            return True
         except Exception as e:
             raise ValueError(f"Error updating item: {str(e)}")
 
+        if result.matched_count == 0:
+            raise ValueError(f"Asset ID {asset_id} not found")
+        self.invalidate_stats()
+        return True
+
     def validate_asset_id(self, asset_id):
-        """Validate the asset ID."""
+        """Validate the asset ID.
+
+        Uniqueness is not checked here; the unique asset_id index rejects
+        duplicates when the item is written.
+        """
         if not asset_id.strip():
             raise ValueError("Asset ID is required")
 
-        # Check if asset ID already exists
-        if self.get_item(asset_id):
-            raise ValueError(f"Asset ID {asset_id} already exists")
-
         return True
 
 
@@ -116,51 +176,62 @@ class InventoryDatabase:
 
     def delete_item(self, asset_id):
         """Delete an item from the inventory."""
-        result = self.inventory.delete_one({'asset_id': asset_id})
-        if result.deleted_count == 0:
+        deleted = self.inventory.find_one_and_delete(
+            {'asset_id': asset_id},
+            projection={'image_id': 1}
+        )
+        if deleted is None:
             raise ValueError(f"Asset ID {asset_id} not found")
+        if deleted.get('image_id'):
+            self._delete_image_file(deleted['image_id'])
+        self.invalidate_stats()
         return True
 
     def search_items(self, search_term):
         """Search for items by ID, name, or description."""
-        query = {
-            '$or': [
-                {'asset_id': {'$regex': search_term, '$options': 'i'}},
-                {'item_name': {'$regex': search_term, '$options': 'i'}},
-                {'description': {'$regex': search_term, '$options': 'i'}},
-                {'location': {'$regex': search_term, '$options': 'i'}},
-                {'department': {'$regex': search_term, '$options': 'i'}}
-            ]
-        }
+        return list(self.iter_search_items(search_term))
+
+    def iter_search_items(self, search_term):
+        """Yield matching items as the cursor returns them."""
+        if search_term:
+            # Match the term literally; characters like ( or + are not regex
+            pattern = {'$regex': re.escape(search_term), '$options': 'i'}
+            query = {
+                '$or': [
+                    {'asset_id': pattern},
+                    {'item_name': pattern},
+                    {'description': pattern},
+                    {'location': pattern},
+                    {'department': pattern}
+                ]
+            }
+        else:
+            # An empty term matches everything; skip the regex scan
+            query = {}
 
-        items = list(self.inventory.find(query))
-        for item in items:
+        # Items saved before images moved to GridFS still carry inline bytes
+        for item in self.inventory.find(query, {'image': 0}):
             item['_id'] = str(item['_id'])
-        return items
+            yield item
 
     def export_to_csv(self, filename="inventory_export.csv"):
         """Export the inventory to CSV, excluding image data."""
         try:
-            # Get all items
-            items = list(self.inventory.find({}))
-            if not items:
+            # Stream only the exported fields; image data stays on the server
+            items = self.inventory.find(
+                {}, {'_id': 0, **{field: 1 for field in EXPORT_FIELDS}}
+            )
+            first = next(items, None)
+            if first is None:
                 raise ValueError("No items to export")
 
-            # Fields to exclude from export
-            exclude_fields = ['_id', 'image']
-
-            # Get field names excluding the ones we don't want
-            fieldnames = [k for k in items[0].keys() if k not in exclude_fields]
-
-            with open(filename, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for item in items:
-                    # Remove excluded fields from each item
-                    for field in exclude_fields:
-                        item.pop(field, None)
-                    writer.writerow(item)
+            with open(filename, 'w', newline='', buffering=1 << 20) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(EXPORT_FIELDS)
+                writer.writerow([first.get(field, '') for field in EXPORT_FIELDS])
+                writer.writerows(
+                    [item.get(field, '') for field in EXPORT_FIELDS] for item in items
+                )
 
             return os.path.abspath(filename)
 
@@ -168,83 +239,172 @@ class InventoryDatabase:
             raise ValueError(f"Error exporting data: {str(e)}")
 
     def get_statistics(self):
-        """Get basic statistics about the inventory."""
+        """Get basic statistics about the inventory.
+
+        Results are reused for STATS_TTL seconds unless an item is added,
+        updated or deleted through this instance.
+        """
+        now = time.monotonic()
+        computed_at, stats = self._stats_cache
+        if stats is not None and now - computed_at < STATS_TTL:
+            return stats
+
+        # One aggregation computes everything on the server instead of a
+        # query per department and condition
+        ignore_empty = {'$nin': ['', None]}
+        result = next(self.inventory.aggregate([
+            {'$facet': {
+                'totals': [
+                    {'$group': {
+                        '_id': None,
+                        'total_items': {'$sum': 1},
+                        'total_value': {'$sum': '$purchase_price'}
+                    }}
+                ],
+                'by_department': [
+                    {'$match': {'department': ignore_empty}},
+                    {'$group': {'_id': '$department', 'count': {'$sum': 1}}},
+                    {'$sort': {'_id': 1}}
+                ],
+                'by_condition': [
+                    {'$match': {'condition': ignore_empty}},
+                    {'$group': {'_id': '$condition', 'count': {'$sum': 1}}},
+                    {'$sort': {'_id': 1}}
+                ]
+            }}
+        ]))
+
+        totals = result['totals'][0] if result['totals'] else {}
         stats = {
-            'total_items': self.inventory.count_documents({}),
-            'total_value': sum(item.get('purchase_price', 0) for item in self.inventory.find()),
-            'items_by_department': {},
-            'items_by_condition': {}
+            'total_items': totals.get('total_items', 0),
+            'total_value': totals.get('total_value', 0),
+            'items_by_department': {row['_id']: row['count'] for row in result['by_department']},
+            'items_by_condition': {row['_id']: row['count'] for row in result['by_condition']}
         }
-
-        # Get department statistics
-        departments = self.inventory.distinct('department')
-        for dept in departments:
-            if dept:  # Ignore empty departments
-                stats['items_by_department'][dept] = self.inventory.count_documents({'department': dept})
-
-        # Get condition statistics
-        conditions = self.inventory.distinct('condition')
-        for cond in conditions:
-            if cond:  # Ignore empty conditions
-                stats['items_by_condition'][cond] = self.inventory.count_documents({'condition': cond})
-
+        self._stats_cache = (now, stats)
         return stats
 
+    def invalidate_stats(self):
+        """Make the next get_statistics call recompute."""
+        self._stats_cache = (0.0, None)
+
     def update_asset_id(self, old_asset_id, new_asset_id):
         """Update an item's asset ID."""
         if old_asset_id == new_asset_id:
             return True
 
-        # Check if new ID exists
-        if self.get_item(new_asset_id):
+        # Rename in place in one round trip; the unique index rejects a
+        # taken ID and the item keeps its _id and image reference
+        try:
+            result = self.inventory.update_one(
+                {'asset_id': old_asset_id},
+                {'$set': {
+                    'asset_id': new_asset_id,
+                    'last_updated': self.get_formatted_time()
+                }}
+            )
+        except DuplicateKeyError:
             raise ValueError(f"Asset ID {new_asset_id} already exists")
 
-        # Get the item data
-        item = self.get_item(old_asset_id)
-        if not item:
+        if result.matched_count == 0:
             raise ValueError(f"Original Asset ID {old_asset_id} not found")
 
-        # Remove _id field if it exists
-        if '_id' in item:
-            del item['_id']
+        return True
 
-        # Update the asset_id
-        item['asset_id'] = new_asset_id
+    def _read_image(self, image_path):
+        """Read an image file, shrinking it to MAX_IMAGE_SIZE if needed."""
+        with open(image_path, 'rb') as image_file:
+            image_data = image_file.read()
 
-        # Insert new document first
-        self.inventory.insert_one(item)
+        if Image is None:
+            return image_data
 
-        # Then delete the old one
-        self.inventory.delete_one({'asset_id': old_asset_id})
+        with Image.open(io.BytesIO(image_data)) as img:
+            if img.width <= MAX_IMAGE_SIZE[0] and img.height <= MAX_IMAGE_SIZE[1]:
+                return image_data
 
-        return True
+            # Apply the EXIF rotation since re-encoding drops the metadata
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            if img.mode in ('RGBA', 'LA', 'P'):
+                img.save(buffer, 'PNG', optimize=True)
+            else:
+                img.convert('RGB').save(buffer, 'JPEG', quality=85, optimize=True)
+            return buffer.getvalue()
 
     def add_image(self, asset_id, image_path):
         """Add or update image for an item."""
         try:
-            with open(image_path, 'rb') as image_file:
-                image_data = image_file.read()
-
-            # Update the item with image data
-            self.inventory.update_one(
-                {'asset_id': asset_id},
-                {'$set': {'image': image_data}}
-            )
+            image_data = self._read_image(image_path)
+
+            # Image bytes live in GridFS; the item keeps a reference and a
+            # version for client caches
+            file_id = self.images.upload_from_stream(asset_id, image_data)
+            try:
+                previous = self.inventory.find_one_and_update(
+                    {'asset_id': asset_id},
+                    {
+                        '$set': {
+                            'image_id': file_id,
+                            'image_version': hashlib.sha1(image_data).hexdigest()
+                        },
+                        '$unset': {'image': ""}
+                    },
+                    projection={'image_id': 1}
+                )
+            except Exception:
+                self._delete_image_file(file_id)
+                raise
+
+            if previous is None:
+                self._delete_image_file(file_id)
+            elif previous.get('image_id'):
+                self._delete_image_file(previous['image_id'])
             return True
         except Exception as e:
             raise ValueError(f"Error adding image: {str(e)}")
 
     def get_image(self, asset_id):
         """Retrieve image data for an item."""
-        item = self.inventory.find_one({'asset_id': asset_id})
-        if item and 'image' in item:
-            return item['image']
+        item = self.inventory.find_one(
+            {'asset_id': asset_id},
+            {'image_id': 1, 'image': 1, '_id': 0}
+        )
+        if not item:
+            return None
+        if 'image_id' in item:
+            try:
+                return self.images.open_download_stream(item['image_id']).read()
+            except NoFile:
+                return None
+        # Stored inline by versions before images moved to GridFS
+        return item.get('image')
+
+    def get_image_version(self, asset_id):
+        """Retrieve the version of an item's image without its data."""
+        item = self.inventory.find_one(
+            {'asset_id': asset_id},
+            {'image_version': 1, '_id': 0}
+        )
+        if item:
+            return item.get('image_version')
         return None
 
     def remove_image(self, asset_id):
         """Remove image from an item."""
-        self.inventory.update_one(
+        previous = self.inventory.find_one_and_update(
             {'asset_id': asset_id},
-            {'$unset': {'image': ""}}
+            {'$unset': {'image': "", 'image_id': "", 'image_version': ""}},
+            projection={'image_id': 1}
         )
-        return True
\ No newline at end of file
+        if previous and previous.get('image_id'):
+            self._delete_image_file(previous['image_id'])
+        return True
+
+    def _delete_image_file(self, file_id):
+        try:
+            self.images.delete(file_id)
+        except NoFile:
+            pass
@@ -17,10 +17,11 @@ from kivy.config import Config
 Config.set('input', 'mouse', 'mouse,disable_multitouch')
 #Config.set('modules', 'monitor', '')
 Config.set('kivy', 'kivy_clock', 'default')
+# Only axis-aligned rectangles are drawn, so skip the multisample buffers
+Config.set('graphics', 'multisamples', '0')
 
 from kivy.core.window import Window
 from kivy.resources import resource_add_path
-from app import InventoryApp
 import os
 import sys
 
@@ -37,6 +38,9 @@ def main():
     if os.path.exists('icon.ico'):
         Window.set_icon('icon.ico')
 
+    # Deferred so the window is set up before the app and its widgets load
+    from app import InventoryApp
+
     # Initialize and run the application
     app = InventoryApp()
     app.run()
@@ -15,6 +15,8 @@ from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.metrics import dp
 from kivy.app import App
+from kivy.clock import Clock
+from types import SimpleNamespace
 
 # Import components
 from components.add_item import AddItemForm
@@ -28,9 +30,12 @@ class InventoryUI(BoxLayout):
         self.padding = dp(20)
         self.spacing = dp(15)
         
-        # Get app instance and styles
+        # Get app instance and colors
         self.app = App.get_running_app()
-        self.styles = self.app.get_common_styles()
+        self._c = SimpleNamespace(**self.app.get_style('colors'))
+
+        # Tab panels, built on first use and kept for later switches
+        self._panels = {}
         
         # Initialize the UI
         self.setup_ui()
@@ -43,7 +48,7 @@ class InventoryUI(BoxLayout):
             size_hint_y=None,
             height=dp(50),
             font_size=dp(24),
-            color=self.styles['colors']['text']
+            color=self._c.text
         ))
         
         # Create menu bar
@@ -53,8 +58,13 @@ class InventoryUI(BoxLayout):
         self.content_area = BoxLayout(orientation='vertical', spacing=dp(10))
         self.add_widget(self.content_area)
         
-        # Show add item form by default
-        self.show_add_item()
+        # Show add item form by default, a frame later so the title and
+        # menu appear without waiting for the form to be built
+        Clock.schedule_once(self._show_default_panel)
+
+    def _show_default_panel(self, dt):
+        if not self.content_area.children:
+            self.show_add_item()
     
     def create_menu(self):
         """Create the main menu buttons."""
@@ -65,7 +75,7 @@ class InventoryUI(BoxLayout):
         )
         
         # Create menu buttons with common style
-        button_style = self.styles['button_style']
+        button_style = self.app.get_style('button_style')
         
         buttons = [
             ('Add Item', self.show_add_item),
@@ -90,10 +100,10 @@ class InventoryUI(BoxLayout):
     def show_message(self, message, message_type='info'):
         """Show a message to the user."""
         color = {
-            'success': self.styles['colors']['success'],
-            'error': self.styles['colors']['error'],
-            'info': self.styles['colors']['text']
-        }.get(message_type, self.styles['colors']['text'])
+            'success': self._c.success,
+            'error': self._c.error,
+            'info': self._c.text
+        }.get(message_type, self._c.text)
         
         self.content_area.add_widget(Label(
             text=message,
@@ -103,23 +113,25 @@ class InventoryUI(BoxLayout):
             height=dp(40)
         ))
     
+    def _show_panel(self, name, panel_class):
+        """Show the named tab panel, building it the first time."""
+        panel = self._panels.get(name)
+        if panel is None:
+            panel = self._panels[name] = panel_class()
+        self.clear_content()
+        self.content_area.add_widget(panel)
+
     def show_add_item(self, *args):
         """Display the add item form."""
-        self.clear_content()
-        add_item_form = AddItemForm()
-        self.content_area.add_widget(add_item_form)
+        self._show_panel('add', AddItemForm)
     
     def show_search(self, *args):
         """Display the search interface."""
-        self.clear_content()
-        search_interface = SearchInterface()
-        self.content_area.add_widget(search_interface)
+        self._show_panel('search', SearchInterface)
     
     def show_export(self, *args):
         """Display the export interface."""
-        self.clear_content()
-        export_interface = ExportInterface()
-        self.content_area.add_widget(export_interface)
+        self._show_panel('export', ExportInterface)
     
     def handle_error(self, error_message):
         """Handle and display errors."""
@@ -14,22 +14,34 @@ Created: January 2024
 from tkinter import Tk, filedialog
 import os
 
+# Dialogs start in the user's home directory
+_HOME = os.path.expanduser("~")
+
+# Hidden Tk root shared by every dialog; creating one starts a Tcl
+# interpreter, which is slow enough to notice on each click
+_root = None
+
+
+def _get_root():
+    global _root
+    if _root is None:
+        _root = Tk()
+        _root.withdraw()  # Hide the main window
+    return _root
+
 
 def choose_image():
     """Open native file dialog for image selection."""
-    root = Tk()
-    root.withdraw()  # Hide the main window
-
     filetypes = (
         ('Image files', '*.png *.jpg *.jpeg *.gif *.bmp'),
         ('All files', '*.*')
     )
 
     file_path = filedialog.askopenfilename(
+        parent=_get_root(),
         title='Choose an image',
-        initialdir=os.path.expanduser("~"),
+        initialdir=_HOME,
         filetypes=filetypes
     )
 
-    root.destroy()
-    return file_path if file_path else None
\ No newline at end of file
+    return file_path if file_path else None
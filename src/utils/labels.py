@@ -0,0 +1,22 @@
+"""
+Inventory Management System
+Created by Landon Robertshaw
+Original code by Claude AI Assistant
+Licensed under CC BY-SA 4.0 (https://creativecommons.org/licenses/by-sa/4.0/)
+
+This code is part of the Inventory Management System, a project that provides
+a user-friendly interface for managing inventory items with image support
+and cloud database integration.
+
+Created: January 2024
+"""
+# utils/labels.py
+
+
+def sync_text_size(label, size):
+    """Keep a label's text box matched to its size for alignment.
+
+    Bind it directly (label.bind(size=sync_text_size)) so every label
+    shares this one callback instead of a per-label setter closure.
+    """
+    label.text_size = size